@@ -1,8 +1,16 @@
 class Command(object):
+    # One Command is allocated per incoming command message; __slots__ keeps
+    # that allocation dict-free and attribute access direct.
+    __slots__ = ("json_command", "type", "id", "system", "fields")
+
     def __init__(self, json_command):
         self.json_command = json_command
         self.type = json_command["type"]
         self.id = json_command["id"]
         self.system = json_command["system"]
-        self.fields = {
-            field["name"]: field["value"] for field in json_command["fields"]}
+        fields = json_command["fields"]
+        # Most commands carry no fields; skip the comprehension setup for them
+        if fields:
+            self.fields = {field["name"]: field["value"] for field in fields}
+        else:
+            self.fields = {}
@@ -1,13 +1,14 @@
 import asyncio
 import base64
 import json
-import os
 import re
 import ssl
 import logging
 import time
 import inspect
 from base64 import b64encode
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import hashlib
 from asgiref.sync import sync_to_async
@@ -19,12 +20,80 @@ except ImportError:
     from asyncio.exceptions import IncompleteReadError
 
 import websockets
+import websockets.exceptions  # not auto-imported by recent websockets versions
+
+try:
+    # Optional: much faster encode/decode on the websocket hot path
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: SIMD-accelerated base64 for large blob payloads
+    import pybase64 as _base64
+except ImportError:
+    _base64 = base64
+
+# Bound once so the blob paths skip the module attribute lookup per call
+_b64encode = _base64.b64encode
+_b64decode = _base64.b64decode
 
 from majortom_gateway.command import Command
 
 logger = logging.getLogger(__name__)
 
+# websockets renamed connect()'s extra_headers to additional_headers when the
+# new asyncio implementation became the default client in 14.0. The rejected-
+# handshake exception changed with it: InvalidStatus (carrying
+# response.status_code) replaced the legacy InvalidStatusCode (carrying
+# status_code directly), which the new client never raises.
+if int(websockets.__version__.split(".")[0]) >= 14:
+    _HEADERS_KWARG = "additional_headers"
+    _INVALID_STATUS_ERRORS = (websockets.exceptions.InvalidStatus,)
+else:
+    _HEADERS_KWARG = "extra_headers"
+    _INVALID_STATUS_ERRORS = (websockets.exceptions.InvalidStatusCode,)
+
 MAX_QUEUE_LENGTH = 10000
+CHECKSUM_BLOCK_SIZE = 1024 * 1024
+# Incoming frames above the websockets default of 1 MiB (e.g. large staged
+# blobs) would otherwise kill the connection with a too-big error.
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+# Incoming-frame buffer, up from the websockets default of 32: bursts of
+# commands/acks get absorbed here instead of back-pressuring the TCP window.
+MAX_RECV_QUEUE = 128
+# Keepalive tuning (seconds). Matches the library defaults, but pinned
+# explicitly so the link-loss detection time is visible and adjustable.
+PING_INTERVAL = 20
+PING_TIMEOUT = 20
+# Dedicated pool for sync callbacks, so slow gateway callbacks cannot starve
+# the event loop's default executor (which other libraries use for DNS
+# lookups, file I/O, etc.) and vice versa.
+SYNC_CALLBACK_MAX_THREADS = 32
+_sync_callback_executor = ThreadPoolExecutor(
+    max_workers=SYNC_CALLBACK_MAX_THREADS,
+    thread_name_prefix="mt-gateway-callback")
+CONTENT_DISPOSITION_FILENAME_RE = re.compile('filename="(.+)";')
+
+EVENT_DEFAULTS = {
+    "system": None,
+    "type": "Gateway Event",
+    "command_id": None,
+    "debug": None,
+    # Can be "debug", "nominal", "warning", or "error".
+    "level": "nominal",
+}
+
+if orjson is not None:
+    def _json_loads(data):
+        return orjson.loads(data)
+
+    def _json_dumps(obj):
+        # orjson produces bytes; the websocket expects a text frame
+        return orjson.dumps(obj).decode("utf-8")
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
 
 
 class MissingContextError(KeyError):
@@ -50,27 +119,46 @@ class GatewayAPI:
         self.transit_callback = transit_callback
         self.received_blob_callback = received_blob_callback
         self.websocket = None
+        self._connected_event = None
         self.mission_name = None
-        self.queued_payloads = []
+        self.queued_payloads = deque(maxlen=MAX_QUEUE_LENGTH)
+        self._background_tasks = set()
+        self._ssl_context = None
+        self._async_cb_cache = {}
         self.shutdown_intended = False
+        self._shutdown_signal = None
         self.headers = {
             "X-Gateway-Token": self.gateway_token
         }
         if self.basic_auth != None:
             userAndPass = b64encode(str.encode(f"{self.basic_auth}")).decode("ascii")
             self.headers['Authorization'] = f'Basic {userAndPass}'
+        # One session for all Major Tom HTTP calls so TCP/TLS connections get
+        # pooled and reused. Bucket uploads deliberately stay off this session
+        # so the gateway token is never sent to the storage host.
+        self._http_session = requests.Session()
+        self._http_session.headers.update(self.headers)
 
     def __build_endpoints(self):
         if self.http:
             self.gateway_endpoint = "ws://" + self.host + "/gateway_api/v1.0"
+            self.http_endpoint = "http://" + self.host
         else:
             self.gateway_endpoint = "wss://" + self.host + "/gateway_api/v1.0"
+            self.http_endpoint = "https://" + self.host
+        self.direct_upload_endpoint = self.http_endpoint + "/rails/active_storage/direct_uploads"
+        self.downlinked_files_endpoint = self.http_endpoint + "/gateway_api/v1.0/downlinked_files"
 
     async def connect(self):
         self.shutdown_intended = False
+        self._shutdown_event.clear()
 
         if self.http:
             ssl_context = None
+        elif self._ssl_context is not None:
+            # Reuse the context built on the first connect; reloading the CA
+            # bundle from disk on every reconnect attempt is wasted work.
+            ssl_context = self._ssl_context
         else:
             ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
 
@@ -82,175 +170,294 @@ class GatewayAPI:
             else:
                 ssl_context.check_hostname = False
                 ssl_context.verify_mode = ssl.CERT_NONE
+            self._ssl_context = ssl_context
 
         logger.info("Connecting to Major Tom")
+        # Gateway traffic is lots of small, already-terse JSON frames plus
+        # base64 blobs, so permessage-deflate costs CPU for little gain.
         self.websocket = await websockets.connect(self.gateway_endpoint,
-                                                  extra_headers=self.headers,
-                                                  ssl=ssl_context)
+                                                  ssl=ssl_context,
+                                                  compression=None,
+                                                  max_size=MAX_MESSAGE_SIZE,
+                                                  max_queue=MAX_RECV_QUEUE,
+                                                  ping_interval=PING_INTERVAL,
+                                                  ping_timeout=PING_TIMEOUT,
+                                                  **{_HEADERS_KWARG: self.headers})
 
         logger.info("Connected to Major Tom")
-        await asyncio.sleep(1)
+        self.connected.set()
 
         await self.empty_queue()
         if self.websocket:  # in empty_queue, websocket can get closed due to excessive latency and we set it to None. We want to just retry in this case.
-            async for message in self.websocket:
-                asyncio.ensure_future(self.handle_message(message))
-                await asyncio.sleep(0)  # Allows execution to jump to wherever it may be needed, such as future or prev message
+            try:
+                async for message in self.websocket:
+                    # handle_message only parses and spawns the (tracked) callback
+                    # task, so await it directly: one task per message instead of
+                    # two, and the recv itself already yields to the loop.
+                    await self.handle_message(message)
+            finally:
+                # The read loop ending means the link is down, whether the
+                # server closed cleanly (loop just ends) or the connection
+                # dropped (ConnectionClosed propagates to the caller).
+                self.connected.clear()
+
+    @property
+    def connected(self):
+        ''' Event that is set while the websocket link is up.
+        Created lazily so that on Python < 3.10, where asyncio.Event binds
+        the current loop at construction, it lands on the running loop
+        rather than whatever loop existed when GatewayAPI was built.
+        '''
+        if self._connected_event is None:
+            self._connected_event = asyncio.Event()
+        return self._connected_event
+
+    @property
+    def _shutdown_event(self):
+        # Lazily created for the same loop-binding reason as `connected`
+        if self._shutdown_signal is None:
+            self._shutdown_signal = asyncio.Event()
+        return self._shutdown_signal
+
+    async def wait_for_connection(self):
+        ''' Waits until the websocket connection to Major Tom is up.
+        Lets gateway code await an event instead of polling self.websocket
+        in a sleep loop.
+        '''
+        await self.connected.wait()
 
     def disconnect(self):
+        self.shutdown_intended = True
+        self._shutdown_event.set()
         if self.websocket:
-            self.shutdown_intended = True
+            self.connected.clear()
             self.websocket.close()
         else:
             logger.warning(
                 "disconnect called but no open websocket connection exists"
             )
 
+    async def _retry_backoff(self):
+        ''' Waits out the reconnect delay, waking immediately if disconnect()
+        is called in the meantime instead of sleeping through it.
+        '''
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=5)
+        except asyncio.TimeoutError:
+            pass
+
     async def connect_with_retries(self):
         while True:
+            if self.shutdown_intended:
+                self.websocket = None
+                return
             try:
                 return await self.connect()
             except websockets.ConnectionClosed as e:
                 if self.shutdown_intended:
                     self.websocket = None
+                    self.connected.clear()
                     return
                 else:
                     raise (e)
             except (OSError, IncompleteReadError, websockets.ConnectionClosed) as e:
                 self.websocket = None
+                self.connected.clear()
                 logger.warning("Connection error encountered, retrying in 5 seconds ({})".format(e))
-                await asyncio.sleep(5)
-            except websockets.exceptions.InvalidStatusCode as e:
+                await self._retry_backoff()
+            except _INVALID_STATUS_ERRORS as e:
                 self.websocket = None
-                if e.status_code == 401:
+                self.connected.clear()
+                status_code = getattr(e, "status_code", None)
+                if status_code is None:
+                    # websockets >= 14 keeps the code on the handshake response
+                    status_code = e.response.status_code
+                if status_code == 401:
                     e.args = [
                         f"{self.host} requires BasicAuth credentials. Please either include that argument or check the validity. Websocket Error: {e.args}"]
                     raise (e)
-                elif e.status_code == 403:
+                elif status_code == 403:
                     e.args = [
                         f"Gateway Token is Invalid: {self.gateway_token} Websocket Error: {e.args}"]
                     raise (e)
-                elif e.status_code == 404 or e.status_code >= 500:
-                    logger.warning(f"Received {e.status_code} when trying to connect, retrying.")
-                    await asyncio.sleep(5)
+                elif status_code == 404 or status_code >= 500:
+                    logger.warning(f"Received {status_code} when trying to connect, retrying.")
+                    await self._retry_backoff()
                 else:
-                    e.args = [f"Unhandled status code returned: {e.status_code}"]
+                    e.args = [f"Unhandled status code returned: {status_code}"]
                     raise (e)
             except Exception as e:
                 logger.error("Unhandled {} in `connect_with_retries`".format(e.__class__.__name__))
                 raise (e)
 
+    def _spawn(self, coro):
+        ''' Schedules a coroutine as a tracked background task.
+        The gateway keeps a strong reference until the task finishes (so it
+        cannot be garbage-collected mid-flight) and logs any exception it
+        raises, instead of fire-and-forget ensure_future.
+        Returns: The scheduled task
+        '''
+        task = asyncio.ensure_future(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        task.add_done_callback(self._handle_task_result)
+        return task
+
+    async def join_background_tasks(self):
+        ''' Waits for every tracked background task (callback invocations,
+        command updates) to finish, including any tasks they spawn.
+        Useful in tests and during shutdown instead of sleeping for a guess.
+        '''
+        while self._background_tasks:
+            await asyncio.gather(*list(self._background_tasks), return_exceptions=True)
+            # Let the done-callbacks run so finished tasks leave the set
+            await asyncio.sleep(0)
+
     async def callCallback(self, cb, *args, **kwargs):
         ''' Calls a callback, handling both when it is an async coroutine or
         a regular sync function.
         Returns: An awaitable task
         '''
         if callable(cb):
-            if asyncio.iscoroutinefunction(cb) or inspect.isawaitable(cb) :
-                task = asyncio.ensure_future(cb(*args, **kwargs))
+            # The coroutine-function check walks wrappers and markers, which
+            # adds up per message; cache the answer per callback object.
+            try:
+                is_async = self._async_cb_cache.get(cb)
+            except TypeError:
+                is_async = None  # unhashable callables can't be looked up
+            if is_async is None:
+                is_async = asyncio.iscoroutinefunction(cb) or inspect.isawaitable(cb)
+                try:
+                    self._async_cb_cache[cb] = is_async
+                except TypeError:
+                    pass  # unhashable callables just skip the cache
+            if is_async:
+                task = self._spawn(cb(*args, **kwargs))
             else:
                 # sync_to_async with thread_sensitive=False runs the sync function in its own thread
                 # see https://docs.djangoproject.com/en/3.2/topics/async/#asgiref.sync.sync_to_async
-                task = asyncio.ensure_future(sync_to_async(cb, thread_sensitive=False)(*args, **kwargs))
-            task.add_done_callback(self._handle_task_result)
+                task = self._spawn(sync_to_async(
+                    cb, thread_sensitive=False,
+                    executor=_sync_callback_executor)(*args, **kwargs))
         else:
             raise ValueError('cb is not callable: {}'.format(dir(cb)))
 
     def _handle_task_result(self, task: asyncio.Task) -> None:
         try:
-            task.result()
+            result = task.result()
         except asyncio.CancelledError:
             pass  # Task cancellation should not be logged as an error.
         except Exception:  # pylint: disable=broad-except
             logger.exception('Exception raised by task = %r', task)
+        else:
+            if inspect.isawaitable(result):
+                # A callback handed back an awaitable (e.g. a sync function
+                # returning a coroutine, or a mock returning a Future);
+                # schedule it instead of silently dropping it.
+                self._spawn(result)
 
     async def handle_message(self, json_data):
-        message = json.loads(json_data)
+        message = _json_loads(json_data)
         message_type = message["type"]
-        logger.debug("From Major Tom: {}".format(message))
-
-        if message_type == "command":
-            command = Command(message["command"])
-            if self.command_callback is not None:
-                """
-                TODO: Track the task and ensure it completes without errors
-                reference: https://medium.com/@yeraydiazdiaz/asyncio-coroutine-patterns-errors-and-cancellation-3bb422e961ff
-                """
-                asyncio.ensure_future(self.callCallback(self.command_callback, command, self))
-            else:
-                asyncio.ensure_future(self.fail_command(command.id, errors=["No command callback implemented"]))
-        elif message_type == "cancel":
-            if self.cancel_callback is not None:
-                """
-                TODO: Track the task and ensure it completes without errors
-                reference: https://medium.com/@yeraydiazdiaz/asyncio-coroutine-patterns-errors-and-cancellation-3bb422e961ff
-                """
-                asyncio.ensure_future(self.callCallback(self.cancel_callback, message["command"]["id"], self))
-            else:
-                asyncio.ensure_future(self.transmit_events(events=[{
-                    "system": None,
-                    "type": "Command Cancellation Failed",
-                    "command_id": message["command"]["id"],
-                    "level": "warning",
-                    "message": "No cancel callback registered. Unable to cancel command."
-                }]))
-        elif message_type == "transit":
-            if self.transit_callback is not None:
-                asyncio.ensure_future(self.callCallback(self.transit_callback, message))
-            else:
-                logger.info("Major Tom expects a ground-station transit will occur: {}".format(message))
-        elif message_type == "received_blob":
-            if self.received_blob_callback is not None:
-                encoded = message.get("blob", "")
-                decoded = base64.b64decode(encoded)
-                context = message["context"]
-                asyncio.ensure_future(self.callCallback(self.received_blob_callback, decoded, context, self))
-            else:
-                logger.debug("Major Tom received a blob (binary satellite data block)")
-        elif message_type == "error":
-            logger.error("Error from Major Tom: {}".format(message["error"]))
-            if self.error_callback is not None:
-                asyncio.ensure_future(self.callCallback(self.error_callback, message))
-        elif message_type == "rate_limit":
-            logger.error("Rate limit from Major Tom: {}".format(message["rate_limit"]))
-            if self.rate_limit_callback is not None:
-                asyncio.ensure_future(self.callCallback(self.rate_limit_callback, message))
-        elif message_type == "hello":
-            self.mission_name = message.get('hello', {}).get('mission')
-            logger.info("Major Tom says hello: {}".format(message))
+        logger.debug("From Major Tom: %s", message)
+
+        handler = self.MESSAGE_HANDLERS.get(message_type)
+        if handler is not None:
+            await handler(self, message)
+        else:
+            logger.warning("Unknown message type %s received from Major Tom: %s",
+                           message_type, message)
+
+    async def _handle_command(self, message):
+        command = Command(message["command"])
+        if self.command_callback is not None:
+            self._spawn(self.callCallback(self.command_callback, command, self))
         else:
-            logger.warning("Unknown message type {} received from Major Tom: {}".format(
-                message_type, message))
+            self._spawn(self.fail_command(command.id, errors=["No command callback implemented"]))
+
+    async def _handle_cancel(self, message):
+        if self.cancel_callback is not None:
+            self._spawn(self.callCallback(self.cancel_callback, message["command"]["id"], self))
+        else:
+            self._spawn(self.transmit_events(events=[{
+                "system": None,
+                "type": "Command Cancellation Failed",
+                "command_id": message["command"]["id"],
+                "level": "warning",
+                "message": "No cancel callback registered. Unable to cancel command."
+            }]))
+
+    async def _handle_transit(self, message):
+        if self.transit_callback is not None:
+            self._spawn(self.callCallback(self.transit_callback, message))
+        else:
+            logger.info("Major Tom expects a ground-station transit will occur: %s", message)
+
+    async def _handle_received_blob(self, message):
+        if self.received_blob_callback is not None:
+            encoded = message.get("blob", "")
+            decoded = _b64decode(encoded)
+            context = message["context"]
+            self._spawn(self.callCallback(self.received_blob_callback, decoded, context, self))
+        else:
+            logger.debug("Major Tom received a blob (binary satellite data block)")
+
+    async def _handle_error(self, message):
+        logger.error("Error from Major Tom: %s", message["error"])
+        if self.error_callback is not None:
+            self._spawn(self.callCallback(self.error_callback, message))
+
+    async def _handle_rate_limit(self, message):
+        logger.error("Rate limit from Major Tom: %s", message["rate_limit"])
+        if self.rate_limit_callback is not None:
+            self._spawn(self.callCallback(self.rate_limit_callback, message))
+
+    async def _handle_hello(self, message):
+        self.mission_name = message.get('hello', {}).get('mission')
+        logger.info("Major Tom says hello: %s", message)
+
+    # Dispatch table for handle_message; looked up once per message instead
+    # of walking an if/elif chain.
+    MESSAGE_HANDLERS = {
+        "command": _handle_command,
+        "cancel": _handle_cancel,
+        "transit": _handle_transit,
+        "received_blob": _handle_received_blob,
+        "error": _handle_error,
+        "rate_limit": _handle_rate_limit,
+        "hello": _handle_hello,
+    }
 
     async def empty_queue(self):
+        # Drain back-to-back: each transmit awaits the websocket send, which
+        # already yields to the event loop, so no artificial delay is needed.
         while len(self.queued_payloads) > 0 and self.websocket:
-            payload = self.queued_payloads.pop(0)
+            payload = self.queued_payloads.popleft()
             await self.transmit(payload)
-            await asyncio.sleep(0.1)
 
     async def transmit(self, payload):
         if self.websocket:
-            logger.debug("To Major Tom: {}".format(payload))
+            logger.debug("To Major Tom: %s", payload)
             try:
-                await self.websocket.send(json.dumps(payload))
+                await self.websocket.send(_json_dumps(payload))
             except Exception as e:
                 logger.error(
                     f"Websocket experienced an error when attempting to transmit: {type(e).__name__}: {e}")
                 self.websocket = None
-                if len(self.queued_payloads) < MAX_QUEUE_LENGTH:
-                    self.queued_payloads.append(payload)
-                else:
-                    logger.warn(
-                        f"Major Tom Client local queue maxed out at {MAX_QUEUE_LENGTH} items. Packet is being dropped.")
+                self.connected.clear()
+                self._queue_payload(payload)
         else:
             logger.info(
                 "Websocket is not connected, queueing payload until connection is re-established.")
-            # Switch to https://docs.python.org/3/library/asyncio-queue.html
-            if len(self.queued_payloads) < MAX_QUEUE_LENGTH:
-                self.queued_payloads.append(payload)
-            else:
-                logger.warn(
-                    f"Major Tom Client local queue maxed out at {MAX_QUEUE_LENGTH} items. Packet is being dropped.")
+            self._queue_payload(payload)
+
+    def _queue_payload(self, payload):
+        # The deque is bounded, so appending past MAX_QUEUE_LENGTH silently
+        # evicts the oldest entry; surface that as a warning.
+        if len(self.queued_payloads) == MAX_QUEUE_LENGTH:
+            logger.warn(
+                f"Major Tom Client local queue maxed out at {MAX_QUEUE_LENGTH} items. Oldest packet is being dropped.")
+        self.queued_payloads.append(payload)
 
     async def transmit_metrics(self, metrics):
         """
@@ -266,55 +473,51 @@ class GatewayAPI:
             ...
         ]
         """
+        # Rows that already carry a timestamp are forwarded as-is rather than
+        # rebuilt key-by-key; only rows missing one get copied to fill it in.
+        now = None
+        measurements = []
+        for metric in metrics:
+            if "timestamp" in metric:
+                measurements.append(metric)
+            else:
+                if now is None:
+                    # Timestamp is expected to be millisecond unix epoch
+                    now = int(time.time() * 1000)
+                measurements.append({**metric, "timestamp": now})
         await self.transmit({
             "type": "measurements",
-            "measurements": [
-                {
-                    "system": metric["system"],
-                    "subsystem": metric["subsystem"],
-                    "metric": metric["metric"],
-                    "value": metric["value"],
-                    # Timestamp is expected to be millisecond unix epoch
-                    "timestamp": metric.get("timestamp", int(time.time() * 1000))
-                } for metric in metrics
-            ]
+            "measurements": measurements
         })
 
     async def transmit_events(self, events):
+        # Events that already carry a timestamp and all default fields are
+        # forwarded as-is; anything else gets the defaults merged in (see
+        # EVENT_DEFAULTS). "message" is the only field with no default.
+        now = None
+        outgoing = []
+        for event in events:
+            if "timestamp" in event and EVENT_DEFAULTS.keys() <= event.keys():
+                outgoing.append(event)
+            else:
+                if now is None:
+                    # Timestamp is expected to be millisecond unix epoch
+                    now = int(time.time() * 1000)
+                outgoing.append({**EVENT_DEFAULTS, "timestamp": now, **event})
         await self.transmit({
             "type": "events",
-            "events": [
-                {
-                    "system": event.get("system", None),
-
-                    "type": event.get("type", "Gateway Event"),
-
-                    "command_id": event.get("command_id", None),
-
-                    "debug": event.get("debug", None),
-
-                    # Can be "debug", "nominal", "warning", or "error".
-                    "level": event.get("level", "nominal"),
-
-                    "message": event["message"],
-
-                    # Timestamp is expected to be millisecond unix epoch
-                    "timestamp": event.get("timestamp", int(time.time() * 1000))
-                } for event in events
-            ]
+            "events": outgoing
         })
 
-    async def transmit_command_update(self, command_id: int, state: str, dict={}):
-        update = {
+    async def transmit_command_update(self, command_id: int, state: str, dict=None):
+        await self.transmit({
             "type": "command_update",
             "command": {
                 "id": command_id,
-                "state": state
+                "state": state,
+                **(dict or {})
             }
-        }
-        for field in dict:
-            update['command'][field] = dict[field]
-        await self.transmit(update)
+        })
 
     async def transmit_blob(self, blob: bytes, context: dict):
         # Transmit bytes to a satellite via a groundstation network. The
@@ -322,7 +525,9 @@ class GatewayAPI:
         await self.transmit({
             "type": "transmit_blob",
             "context": context,
-            "blob": base64.b64encode(blob).decode("cp437")
+            # base64 output is pure ASCII, so decode directly instead of
+            # round-tripping through the cp437 codec
+            "blob": _b64encode(blob).decode("ascii")
         })
 
     async def fail_command(self, command_id: int, errors: list):
@@ -360,7 +565,7 @@ class GatewayAPI:
             }
         })
 
-    async def update_file_list(self, system: str, files: list, timestamp=int(time.time() * 1000)):
+    async def update_file_list(self, system: str, files: list, timestamp=None):
         """
         "files" must be of the format:
         [
@@ -373,6 +578,8 @@ class GatewayAPI:
           ...
         ]
         """
+        if timestamp is None:
+            timestamp = int(time.time() * 1000)
         await self.transmit({
             "type": "file_list",
             "file_list": {
@@ -382,70 +589,88 @@ class GatewayAPI:
             }
         })
 
-    def download_staged_file(self, gateway_download_path):
-        if self.http:
-            download_url = "http://"
-        else:
-            download_url = "https://"
-        download_url = download_url + self.host + gateway_download_path
+    def download_staged_file(self, gateway_download_path, destination_path=None):
+        ''' Downloads a staged file from Major Tom.
+        By default the file content is returned as bytes. Passing
+        destination_path instead streams the body to that path in blocks so
+        large files never sit in memory whole; the path is returned in place
+        of the content.
+        '''
+        download_url = self.http_endpoint + gateway_download_path
 
         # Download the file
-        r = requests.get(download_url, headers=self.headers)
+        r = self._http_session.get(download_url, stream=destination_path is not None)
         for field in r.headers:
-            logger.debug(f'{field}  :  {r.headers[field]}')
+            logger.debug('%s  :  %s', field, r.headers[field])
         if r.status_code != 200:
             raise (RuntimeError(f"File Download Failed. Status code: {r.status_code}"))
-        filename = re.findall('filename="(.+)";', r.headers['Content-Disposition'])[0]
-        logger.info(f"Downloaded Staged File: {filename}")
+        filename = CONTENT_DISPOSITION_FILENAME_RE.findall(r.headers['Content-Disposition'])[0]
+        if destination_path is not None:
+            with open(destination_path, 'wb') as out_handle:
+                for block in r.iter_content(CHECKSUM_BLOCK_SIZE):
+                    out_handle.write(block)
+            logger.info("Downloaded Staged File: %s", filename)
+            return filename, destination_path
+        logger.info("Downloaded Staged File: %s", filename)
         return filename, r.content
 
+    async def download_staged_file_async(self, *args, **kwargs):
+        ''' Same as download_staged_file, but run in a worker thread so the
+        blocking HTTP transfer does not stall the websocket event loop.
+        '''
+        return await sync_to_async(
+            self.download_staged_file, thread_sensitive=False)(*args, **kwargs)
+
     def upload_downlinked_file(
         self,
         filename: str,
         filepath: str,
         system: str,
-        timestamp=time.time()*1000,
+        timestamp=None,
         content_type="binary/octet-stream",
         command_id=None,
         metadata=None,
     ):
-        # Get size and checksum
-        byte_size = int(os.path.getsize(filepath))
+        if timestamp is None:
+            timestamp = time.time() * 1000
+        # The file is opened once: a single pass in blocks yields both the
+        # size and the checksum, then the handle is rewound for the PUT.
         with open(filepath, 'rb') as file_handle:
-            checksum = b64encode(hashlib.md5(file_handle.read()).digest())
-
-        # Data to request upload
-        request_data = {
-            "filename": filename,
-            "byte_size": byte_size,
-            "content_type": content_type,
-            "checksum": checksum
-        }
+            md5 = hashlib.md5()
+            byte_size = 0
+            for block in iter(lambda: file_handle.read(CHECKSUM_BLOCK_SIZE), b''):
+                md5.update(block)
+                byte_size += len(block)
+            checksum = b64encode(md5.digest())
+
+            # Data to request upload
+            request_data = {
+                "filename": filename,
+                "byte_size": byte_size,
+                "content_type": content_type,
+                "checksum": checksum
+            }
 
-        # POST file info to Major Tom and get upload info
-        if self.http:
-            request_url = "http://"
-        else:
-            request_url = "https://"
-        request_url += self.host + "/rails/active_storage/direct_uploads"
-        logging.debug(f"Requesting {request_url} with data: {request_data}")
-        request_r = requests.post(url=request_url, headers=self.headers, data=request_data)
-        if request_r.status_code != 200:
-            logger.error(
-                f"Transaction Failed. Status code: {request_r.status_code} \n Text Response: {request_r.text}")
-            raise (RuntimeError(f"File Upload Request Failed. Status code: {request_r.status_code}"))
-        request_content = json.loads(request_r.content)
-        for field in request_content:
-            logger.debug(f'{field}  :  {request_content[field]}')
-
-        # PUT file to MT file bucket (S3 or Minio)
-        headers = {
-            "Content-Type": content_type,
-            "Content-MD5": checksum
-        }
-        upload_url = request_content["direct_upload"]["url"]
-        logger.debug(f"Headers: {headers}\nUpload URL: {upload_url}")
-        with open(filepath, 'rb') as file_handle:
+            # POST file info to Major Tom and get upload info
+            request_url = self.direct_upload_endpoint
+            logger.debug("Requesting %s with data: %s", request_url, request_data)
+            request_r = self._http_session.post(url=request_url, data=request_data)
+            if request_r.status_code != 200:
+                logger.error(
+                    f"Transaction Failed. Status code: {request_r.status_code} \n Text Response: {request_r.text}")
+                raise (RuntimeError(f"File Upload Request Failed. Status code: {request_r.status_code}"))
+            request_content = json.loads(request_r.content)
+            for field in request_content:
+                logger.debug('%s  :  %s', field, request_content[field])
+
+            # PUT file to MT file bucket (S3 or Minio)
+            headers = {
+                "Content-Type": content_type,
+                "Content-MD5": checksum
+            }
+            upload_url = request_content["direct_upload"]["url"]
+            logger.debug("Headers: %s\nUpload URL: %s", headers, upload_url)
+            file_handle.seek(0)
             upload_r = requests.put(
                 url=upload_url,
                 headers=headers,
@@ -469,13 +694,15 @@ class GatewayAPI:
             file_data["metadata"] = metadata
 
         # POST file data to Major Tom
-        if self.http:
-            file_data_url = "http://"
-        else:
-            file_data_url = "https://"
-        file_data_url += self.host + "/gateway_api/v1.0/downlinked_files"
-        file_data_r = requests.post(url=file_data_url, headers=self.headers, json=file_data)
+        file_data_r = self._http_session.post(url=self.downlinked_files_endpoint, json=file_data)
         if file_data_r.status_code != 200:
             logger.error(
                 f"Transaction Failed. Status code: {file_data_r.status_code} \n Text Response: {file_data_r.text}")
             raise (RuntimeError(f"File Data Post Failed. Status code: {file_data_r.status_code}"))
+
+    async def upload_downlinked_file_async(self, *args, **kwargs):
+        ''' Same as upload_downlinked_file, but run in a worker thread so the
+        blocking HTTP transfers do not stall the websocket event loop.
+        '''
+        return await sync_to_async(
+            self.upload_downlinked_file, thread_sensitive=False)(*args, **kwargs)
@@ -21,18 +21,28 @@ setuptools.setup(
     packages=setuptools.find_packages(exclude=["*.tests", "*.tests.*", "tests.*", "tests"]),
     classifiers=[
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
+        "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3 :: Only",
         "Topic :: Software Development :: Libraries :: Python Modules",
         "Intended Audience :: Developers",
         "License :: OSI Approved :: Apache Software License",
         "Operating System :: OS Independent"
     ],
-    python_requires='>=3.6',
+    python_requires='>=3.7',
     keywords='majortom major_tom gateway kubos major tom satellite',
     install_requires=[
         "websockets",
         "requests",
-        "asgiref"
-    ]
+        "asgiref>=3.5"
+    ],
+    extras_require={
+        # Optional performance extras: orjson speeds up the websocket
+        # JSON hot path, uvloop speeds up the event loop itself (the
+        # hosting application must call uvloop.install() before running).
+        "speedups": [
+            "orjson",
+            "pybase64",
+            "uvloop; sys_platform != 'win32'"
+        ]
+    }
 )
@@ -0,0 +1,24 @@
+try:
+    # Python 3.8+
+    from unittest.mock import AsyncMock
+except ImportError:
+    # Python 3.7
+    from mock import AsyncMock
+
+import pytest
+
+
+class TypeMatcher:
+    def __init__(self, expected_type):
+        self.expected_type = expected_type
+
+    def __eq__(self, other):
+        return isinstance(other, self.expected_type)
+
+
+@pytest.fixture
+def callback_mock():
+    # A plain AsyncMock: awaiting it just works. Wrapping the return value in
+    # a pre-resolved asyncio.Future (the old pattern here) needs an event
+    # loop at fixture-setup time and leaves a dangling awaitable behind.
+    return AsyncMock(return_value=42)
@@ -4,7 +4,7 @@ try:
     # Python 3.8+
     from unittest.mock import AsyncMock
 except ImportError:
-    # Python 3.6+
+    # Python 3.7
     from mock import AsyncMock
 from unittest.mock import ANY
 from majortom_gateway import GatewayAPI
@@ -14,12 +14,7 @@ import base64
 import logging
 import time
 
-class TypeMatcher:
-    def __init__(self, expected_type):
-        self.expected_type = expected_type
-
-    def __eq__(self, other):
-        return isinstance(other, self.expected_type)
+from tests.conftest import TypeMatcher
 
 MESSAGE = json.dumps({
         "type": "command",
@@ -31,13 +26,6 @@ MESSAGE = json.dumps({
         }
     })
 
-@pytest.fixture
-def callback_mock():
-    future = asyncio.Future()
-    future.set_result(42)
-    fn = AsyncMock(return_value=future) 
-    return fn
-
 @pytest.mark.asyncio
 async def test_fails_when_no_command_callback(monkeypatch):
     gw = GatewayAPI("host", "gateway_token")
@@ -47,7 +35,7 @@ async def test_fails_when_no_command_callback(monkeypatch):
     monkeypatch.setattr(gw, "fail_command", mock_fail_command)
 
     await gw.handle_message(MESSAGE)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     assert mock_fail_command.called
 
@@ -56,7 +44,7 @@ async def test_calls_command_callback(callback_mock):
     gw = GatewayAPI("host", "gateway_token", command_callback=callback_mock)
 
     await gw.handle_message(MESSAGE)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     # Make sure that the command callback was called with the command and Gateway
     callback_mock.assert_called_once_with(TypeMatcher(Command), TypeMatcher(GatewayAPI))
@@ -72,7 +60,7 @@ async def test_calls_command_callback_v2():
     gw = GatewayAPI("host", "gateway_token", command_callback=cb)
 
     await gw.handle_message(MESSAGE)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
 
     assert result["worked"]
 
@@ -87,7 +75,7 @@ async def test_initializes_mission_name_from_hello_message(callback_mock):
     })
 
     await gw.handle_message(message)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
 
     assert gw.mission_name == "MISSION NAME"
 
@@ -103,7 +91,7 @@ async def test_calls_cancel_callback(callback_mock):
     })
 
     await gw.handle_message(message)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     # The cancel callback is called with the command id and the gateway
     callback_mock.assert_called_once_with(20, TypeMatcher(GatewayAPI))
@@ -121,7 +109,7 @@ async def test_calls_rate_limit_callback(callback_mock):
     }
 
     await gw.handle_message(json.dumps(message))
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     # The rate limit callback is given the raw message
     callback_mock.assert_called_once_with(message)
@@ -137,7 +125,7 @@ async def test_calls_error_callback(callback_mock):
     }
 
     await gw.handle_message(json.dumps(message))
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     # The error callback is given the raw message
     callback_mock.assert_called_once_with(message)
@@ -152,7 +140,7 @@ async def test_calls_transit_callback(callback_mock):
     }
 
     await gw.handle_message(json.dumps(message))
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     # The transit callback is given the raw message
     callback_mock.assert_called_once_with(message)
@@ -174,7 +162,7 @@ async def test_calls_received_blob_callback(callback_mock):
     })
 
     await gw.handle_message(message)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     # The received_blob callback is given the decoded blob, the context, and the gateway
     callback_mock.assert_called_once_with(blob, ANY, TypeMatcher(GatewayAPI))
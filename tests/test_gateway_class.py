@@ -1,6 +1,8 @@
 import pytest
+import websockets.exceptions
 from majortom_gateway import GatewayAPI
 import logging
+from types import SimpleNamespace
 
 def test_logging_output():
     # A simple test to see what output is being captured
@@ -13,3 +15,44 @@ def test_logging_output():
 def test_required_args():
     with pytest.raises(TypeError):
         gw = GatewayAPI()
+
+class FakeWebsocket:
+    # Minimal stand-in: yields no messages, as if the server closed cleanly
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        raise StopAsyncIteration
+
+    async def send(self, payload):
+        pass
+
+@pytest.mark.asyncio
+async def test_connected_event_clears_when_server_closes(monkeypatch):
+    gw = GatewayAPI("host", "gateway_token", http=True)
+
+    async def fake_connect(*args, **kwargs):
+        return FakeWebsocket()
+
+    monkeypatch.setattr("majortom_gateway.gateway_api.websockets.connect", fake_connect)
+
+    await gw.connect()
+
+    # The read loop ended, so wait_for_connection must not report the link up
+    assert not gw.connected.is_set()
+
+@pytest.mark.asyncio
+async def test_invalid_token_status_stops_retrying(monkeypatch):
+    ''' A 403 handshake rejection must abort the retry loop with the
+    explanatory message, on new websockets versions too. '''
+    gw = GatewayAPI("host", "gateway_token", http=True)
+
+    async def fake_connect(*args, **kwargs):
+        raise websockets.exceptions.InvalidStatus(SimpleNamespace(status_code=403))
+
+    monkeypatch.setattr("majortom_gateway.gateway_api.websockets.connect", fake_connect)
+
+    with pytest.raises(websockets.exceptions.InvalidStatus) as excinfo:
+        await gw.connect_with_retries()
+
+    assert "Gateway Token is Invalid" in excinfo.value.args[0]
@@ -4,7 +4,7 @@ try:
     # Python 3.8+
     from unittest.mock import AsyncMock
 except ImportError:
-    # Python 3.6+
+    # Python 3.7
     from mock import AsyncMock
 from unittest.mock import ANY
 from majortom_gateway import GatewayAPI
@@ -49,9 +49,8 @@ async def test_sync_callbacks_can_be_run_async():
         await gw.handle_message(message)
     logging.info("end await")
     
-    # The sync commands should finish before this is done
-    # If they don't, a bunch of errors will (hopefully) be generated.
-    await asyncio.sleep(3)  
+    # Wait for every queued sync command to finish on its worker thread
+    await gw.join_background_tasks()
 
 @pytest.mark.asyncio
 async def test_calls_SYNC_command_callback():
@@ -63,7 +62,27 @@ async def test_calls_SYNC_command_callback():
     gw = GatewayAPI("host", "gateway_token", command_callback=cb)
 
     await gw.handle_message(MESSAGE)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
+
+    assert result["worked"]
+
+
+@pytest.mark.asyncio
+async def test_calls_SYNC_unhashable_callback():
+    ''' Unhashable callables can't enter the async-vs-sync cache, but must
+    still be dispatched. '''
+    result = { "worked": False }
+
+    class UnhashableCallback:
+        __hash__ = None
+
+        def __call__(self, *args, **kwargs):
+            result["worked"] = True
+
+    gw = GatewayAPI("host", "gateway_token", command_callback=UnhashableCallback())
+
+    await gw.handle_message(MESSAGE)
+    await gw.join_background_tasks()
 
     assert result["worked"]
 
@@ -77,7 +96,7 @@ async def test_error_propagation_on_SYNC_command_callback(caplog):
     gw = GatewayAPI("host", "gateway_token", command_callback=cb)
 
     await gw.handle_message(MESSAGE)
-    await asyncio.sleep(1)  # Give time for the callback to run
+    await gw.join_background_tasks()  # Let the callback run (and fail)
     
     assert 'This exception message should be visible' in caplog.text
 
@@ -98,7 +117,7 @@ async def test_calls_SYNC_cancel_callback():
     })
 
     await gw.handle_message(message)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     assert result["worked"]
 
@@ -120,7 +139,7 @@ async def test_calls_SYNC_rate_limit_callback():
     }
 
     await gw.handle_message(json.dumps(message))
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
     assert result["worked"]
 
@@ -140,7 +159,7 @@ async def test_calls_SYNC_error_callback():
     }
 
     await gw.handle_message(json.dumps(message))
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
 
 
@@ -158,7 +177,7 @@ async def test_calls_transit_callback():
     }
 
     await gw.handle_message(json.dumps(message))
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
 
 @pytest.mark.asyncio
@@ -183,6 +202,6 @@ async def test_calls_SYNC_received_blob_callback():
     })
 
     await gw.handle_message(message)
-    await asyncio.sleep(1)
+    await gw.join_background_tasks()
     
 